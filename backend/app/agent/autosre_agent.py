@@ -1,4 +1,4 @@
-import uuid
+from secrets import token_hex
 from datetime import datetime
 
 from app.core.health import HealthChecker
@@ -27,7 +27,7 @@ class AutoSREAgent:
 
     async def create_incident(self, service, metrics):
         incident = Incident(
-            id=str(uuid.uuid4()),
+            id=token_hex(16),
             service_id=service.id,
             service_name=service.name,
             type="auto_detected",
@@ -64,3 +64,6 @@ class AutoSREAgent:
 
         incident.status = "resolved"
         incident.resolved_at = datetime.now()
+
+    async def shutdown(self):
+        await self.health_checker.close()
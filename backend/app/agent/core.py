@@ -2,11 +2,14 @@
 AutoSRE Agent Core with Local AI
 """
 import asyncio
-import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-import uuid
+from typing import Dict, List, Optional, Set, Tuple
+from secrets import token_hex
 import docker
+import orjson
 
 from app.agent.local_ai import local_ai
 from app.monitoring.health import HealthChecker
@@ -14,24 +17,56 @@ from app.monitoring.metrics import MetricsCollector
 from app.agent.actions import ActionExecutor
 from app.models.schemas import Service, Incident, Action
 from app.utils.logger import setup_logger
-from app.api.websocket import manager as ws_manager
+from app.api.websockets import manager as ws_manager
 
 logger = setup_logger(__name__)
 
+# Flush queued WebSocket events early once this many pile up in one cycle
+BROADCAST_BATCH_SIZE = 50
+
+# Max per-service checks running concurrently in one monitoring pass
+MAX_CONCURRENT_CHECKS = 50
+
+# Max health probes / Docker API calls in flight at once
+MAX_CONCURRENT_HEALTH_CHECKS = 10
+
+# Seconds a resolved incident is kept before it is dropped from memory
+RESOLVED_INCIDENT_TTL = 3600
+
 class AutoSREAgent:
     """Main AutoSRE agent with local AI"""
     
     def __init__(self):
-        self.agent_id = f"autosre-{uuid.uuid4().hex[:8]}"
+        self.agent_id = f"autosre-{token_hex(4)}"
         self.services: Dict[str, Service] = {}
         self.incidents: Dict[str, Incident] = {}
+        # Open incident ids per service, so resolving doesn't scan every incident
+        self.incidents_by_service: Dict[str, Set[str]] = defaultdict(set)
+        # Serialized incidents keyed by id, tagged with the status they were built at
+        self._incident_payloads: Dict[str, Tuple[str, Dict]] = {}
+        # (monotonic resolve time, incident id), oldest first
+        self._resolved_ring: deque = deque()
         self.running = False
         
+        # Timestamp shared by everything recorded within one monitoring cycle
+        self._now = datetime.now()
+        
+        # WebSocket events queued during a cycle, sent as one batch frame
+        self._ws_batch: List[Dict] = []
+        
+        # Bounds the per-service health/metrics fan-out
+        self._fanout_sem = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+        # Tighter bound for health probes and Docker calls
+        self._health_sem = asyncio.Semaphore(MAX_CONCURRENT_HEALTH_CHECKS)
+        
         # Initialize components
         self.health_checker = HealthChecker()
         self.metrics_collector = MetricsCollector()
         self.action_executor = ActionExecutor()
         
+        # Local AI calls are synchronous; run them off the event loop
+        self._ml_executor = ThreadPoolExecutor(max_workers=2)
+        
         # Docker client
         try:
             self.docker_client = docker.from_env()
@@ -43,6 +78,7 @@ class AutoSREAgent:
         """Initialize the agent"""
         logger.info(f"🔄 Initializing AutoSRE Agent: {self.agent_id}")
         await self.discover_services()
+        await self._flush_events()
         logger.info(f"✅ Discovered {len(self.services)} services")
     
     async def discover_services(self):
@@ -53,18 +89,28 @@ class AutoSREAgent:
             return
         
         try:
-            containers = self.docker_client.containers.list()
+            # The Docker SDK is blocking, so keep its API calls off the event loop
+            loop = asyncio.get_running_loop()
+            async with self._health_sem:
+                containers = await loop.run_in_executor(
+                    None, self.docker_client.containers.list
+                )
             
             for container in containers:
                 labels = container.labels
                 
                 if labels.get("autosre.monitor", "false").lower() == "true":
+                    async with self._health_sem:
+                        image_tags = await loop.run_in_executor(
+                            None, lambda c=container: c.image.tags
+                        )
+                    
                     service = Service(
                         id=container.id[:12],
                         name=labels.get("autosre.service.name", container.name),
                         type=labels.get("autosre.service.type", "http"),
                         container_id=container.id,
-                        image=container.image.tags[0] if container.image.tags else "unknown",
+                        image=image_tags[0] if image_tags else "unknown",
                         port=int(labels.get("autosre.service.port", "8080")),
                         health_endpoint=labels.get("autosre.health.endpoint", "/health"),
                         status="unknown",
@@ -74,7 +120,7 @@ class AutoSREAgent:
                     self.services[service.id] = service
                     
                     # Notify WebSocket
-                    await ws_manager.broadcast({
+                    await self._queue_event({
                         "type": "service_discovered",
                         "service": service.dict()
                     })
@@ -128,6 +174,8 @@ class AutoSREAgent:
         
         while self.running:
             try:
+                self._now = datetime.now()
+                
                 # 1. Check service health
                 await self.check_services_health()
                 
@@ -138,6 +186,12 @@ class AutoSREAgent:
                 if self.incidents:
                     await self.analyze_and_act()
                 
+                # 4. Send this cycle's events in one frame
+                await self._flush_events()
+                
+                # 5. Forget incidents resolved long ago
+                self._evict_resolved_incidents()
+                
                 # Wait for next cycle
                 await asyncio.sleep(30)  # Every 30 seconds
                 
@@ -149,24 +203,33 @@ class AutoSREAgent:
     
     async def check_services_health(self):
         """Check health of all services"""
-        for service_id, service in self.services.items():
+        await asyncio.gather(
+            *(self._check_one(service_id, service)
+              for service_id, service in list(self.services.items())),
+            return_exceptions=True
+        )
+    
+    async def _check_one(self, service_id: str, service: Service):
+        """Check health of a single service"""
+        async with self._fanout_sem:
             try:
-                is_healthy = await self.health_checker.check(service)
+                async with self._health_sem:
+                    is_healthy = await self.health_checker.check(service)
                 
                 if is_healthy:
                     service.status = "healthy"
-                    service.last_check = datetime.now()
+                    service.last_check = self._now
                     
                     # Resolve any active incidents for this service
                     self._resolve_service_incidents(service_id)
                     
                 else:
                     service.status = "unhealthy"
-                    service.last_check = datetime.now()
+                    service.last_check = self._now
                     
                     # Create incident
                     incident = Incident(
-                        id=str(uuid.uuid4()),
+                        id=token_hex(16),
                         service_id=service_id,
                         service_name=service.name,
                         type="health",
@@ -174,15 +237,15 @@ class AutoSREAgent:
                         description=f"Service {service.name} is unhealthy",
                         metrics={"health": "failed"},
                         status="detected",
-                        detected_at=datetime.now()
+                        detected_at=self._now
                     )
                     
-                    self.incidents[incident.id] = incident
+                    self._add_incident(incident)
                     
                     # Notify via WebSocket
-                    await ws_manager.broadcast({
+                    await self._queue_event({
                         "type": "incident_detected",
-                        "incident": incident.dict()
+                        "incident": self._incident_payload(incident)
                     })
                     
             except Exception as e:
@@ -190,58 +253,92 @@ class AutoSREAgent:
     
     async def collect_metrics(self):
         """Collect metrics from services"""
-        for service_id, service in self.services.items():
-            try:
-                metrics = await self.metrics_collector.collect(service)
+        services = list(self.services.items())
+        results = await asyncio.gather(
+            *(self._collect_one(service) for _, service in services),
+            return_exceptions=True
+        )
+        
+        collected = [
+            (service_id, service, metrics)
+            for (service_id, service), metrics in zip(services, results)
+            if metrics and not isinstance(metrics, BaseException)
+        ]
+        if not collected:
+            return
+        
+        # Detect anomalies for all services in one local AI call
+        loop = asyncio.get_running_loop()
+        anomalies = await loop.run_in_executor(
+            self._ml_executor,
+            local_ai.detect_anomaly_batch,
+            [m for _, _, m in collected]
+        )
+        
+        for (service_id, service, metrics), anomaly in zip(collected, anomalies):
+            if anomaly.get("is_anomaly", False):
+                # Create incident for anomaly
+                incident = Incident(
+                    id=token_hex(16),
+                    service_id=service_id,
+                    service_name=service.name,
+                    type="anomaly",
+                    severity=float(anomaly.get("probability", 0.5)),
+                    description=f"Anomaly detected in {service.name}",
+                    metrics=metrics,
+                    status="detected",
+                    detected_at=self._now
+                )
                 
-                if metrics:
-                    # Detect anomalies using local AI
-                    anomaly = local_ai.detect_anomaly(metrics)
-                    
-                    if anomaly.get("is_anomaly", False):
-                        # Create incident for anomaly
-                        incident = Incident(
-                            id=str(uuid.uuid4()),
-                            service_id=service_id,
-                            service_name=service.name,
-                            type="anomaly",
-                            severity=float(anomaly.get("probability", 0.5)),
-                            description=f"Anomaly detected in {service.name}",
-                            metrics=metrics,
-                            status="detected",
-                            detected_at=datetime.now()
-                        )
-                        
-                        self.incidents[incident.id] = incident
-                        
-                        # Notify via WebSocket
-                        await ws_manager.broadcast({
-                            "type": "incident_detected",
-                            "incident": incident.dict()
-                        })
-                        
+                self._add_incident(incident)
+                
+                # Notify via WebSocket
+                await self._queue_event({
+                    "type": "incident_detected",
+                    "incident": self._incident_payload(incident)
+                })
+    
+    async def _collect_one(self, service: Service) -> Optional[Dict]:
+        """Collect metrics from a single service"""
+        async with self._fanout_sem:
+            try:
+                return await self.metrics_collector.collect(service)
             except Exception as e:
                 logger.error(f"Metrics collection failed for {service.name}: {e}")
+                return None
     
     async def analyze_and_act(self):
         """Analyze incidents and take action using local AI"""
-        # Group incidents by service
-        incidents_by_service = {}
-        for incident_id, incident in self.incidents.items():
-            if incident.status == "detected":
-                if incident.service_id not in incidents_by_service:
-                    incidents_by_service[incident.service_id] = []
-                incidents_by_service[incident.service_id].append(incident)
-        
-        for service_id, service_incidents in incidents_by_service.items():
+        # Group each service's open, not yet analyzed incidents
+        groups = []
+        for service_id, incident_ids in self.incidents_by_service.items():
             service = self.services.get(service_id)
             if not service:
                 continue
             
-            # Analyze with local AI
-            incidents_data = [inc.dict() for inc in service_incidents]
-            analysis = local_ai.analyze_incident(incidents_data)
-            
+            service_incidents = [
+                incident for incident in map(self.incidents.get, incident_ids)
+                if incident is not None and incident.status == "detected"
+            ]
+            if service_incidents:
+                groups.append((service, service_incidents))
+        
+        # Analyze every affected service with local AI in one batch
+        
+        if not groups:
+            return
+        
+        loop = asyncio.get_running_loop()
+        analyses = await loop.run_in_executor(
+            self._ml_executor,
+            local_ai.analyze_incidents_batch,
+            [
+                [self._incident_payload(inc) for inc in service_incidents]
+                for _, service_incidents in groups
+            ]
+        )
+        
+        for (service, service_incidents), analysis in zip(groups, analyses):
             # Decide action
             service_info = {
                 "name": service.name,
@@ -267,7 +364,7 @@ class AutoSREAgent:
             
             # Create action record
             action = Action(
-                id=str(uuid.uuid4()),
+                id=token_hex(16),
                 type=decision["action"],
                 service_id=service.id,
                 service_name=service.name,
@@ -284,7 +381,7 @@ class AutoSREAgent:
                 incident.updated_at = datetime.now()
             
             # Notify via WebSocket
-            await ws_manager.broadcast({
+            await self._queue_event({
                 "type": "action_taken",
                 "action": action.dict()
             })
@@ -299,7 +396,8 @@ class AutoSREAgent:
     async def verify_action(self, service: Service, action: Action):
         """Verify if action was successful"""
         try:
-            is_healthy = await self.health_checker.check(service)
+            async with self._health_sem:
+                is_healthy = await self.health_checker.check(service)
             
             if is_healthy:
                 # Action successful
@@ -307,13 +405,12 @@ class AutoSREAgent:
                 action.result["success"] = True
                 
                 # Resolve incidents
-                for incident_id, incident in self.incidents.items():
-                    if incident.service_id == service.id and incident.status == "action_taken":
-                        incident.status = "resolved"
-                        incident.resolved_at = datetime.now()
+                self._resolve_service_incidents(
+                    service.id, status="action_taken", resolved_at=datetime.now()
+                )
                 
                 # Notify via WebSocket
-                await ws_manager.broadcast({
+                await self._queue_event({
                     "type": "action_success",
                     "service_id": service.id,
                     "action_id": action.id
@@ -324,7 +421,7 @@ class AutoSREAgent:
                 action.result["success"] = False
                 
                 # Escalate or try different action
-                await ws_manager.broadcast({
+                await self._queue_event({
                     "type": "action_failed",
                     "service_id": service.id,
                     "action_id": action.id
@@ -333,14 +430,69 @@ class AutoSREAgent:
         except Exception as e:
             logger.error(f"Verification failed: {e}")
     
-    def _resolve_service_incidents(self, service_id: str):
-        """Resolve all incidents for a service"""
-        for incident_id, incident in list(self.incidents.items()):
-            if incident.service_id == service_id and incident.status == "detected":
+    async def _queue_event(self, event: Dict):
+        """Queue a WebSocket event, flushing early if the batch is full"""
+        self._ws_batch.append(event)
+        if len(self._ws_batch) >= BROADCAST_BATCH_SIZE:
+            await self._flush_events()
+            await asyncio.sleep(0)
+    
+    async def _flush_events(self):
+        """Broadcast all queued events as a single batch message"""
+        if not self._ws_batch:
+            return
+        events, self._ws_batch = self._ws_batch, []
+        await ws_manager.broadcast_raw(orjson.dumps({
+            "type": "batch",
+            "events": events
+        }))
+    
+    def _add_incident(self, incident: Incident):
+        """Register a new incident and index it by service"""
+        self.incidents[incident.id] = incident
+        self.incidents_by_service[incident.service_id].add(incident.id)
+    
+    def _incident_payload(self, incident: Incident) -> Dict:
+        """Serialized incident, rebuilt only when its status has changed"""
+        cached = self._incident_payloads.get(incident.id)
+        if cached is not None and cached[0] == incident.status:
+            return cached[1]
+        
+        payload = incident.dict()
+        self._incident_payloads[incident.id] = (incident.status, payload)
+        return payload
+    
+    def _resolve_service_incidents(self, service_id: str, status: str = "detected",
+                                   resolved_at: Optional[datetime] = None):
+        """Resolve all incidents for a service that are in the given status"""
+        resolved_at = resolved_at or self._now
+        open_ids = self.incidents_by_service.get(service_id)
+        if not open_ids:
+            return
+        
+        for incident_id in list(open_ids):
+            incident = self.incidents.get(incident_id)
+            if incident is None:
+                open_ids.discard(incident_id)
+                self._incident_payloads.pop(incident_id, None)
+            elif incident.status == status:
                 incident.status = "resolved"
-                incident.resolved_at = datetime.now()
+                incident.resolved_at = resolved_at
+                open_ids.discard(incident_id)
+                self._incident_payloads.pop(incident_id, None)
+                self._resolved_ring.append((time.monotonic(), incident_id))
+    
+    def _evict_resolved_incidents(self):
+        """Drop incidents resolved more than RESOLVED_INCIDENT_TTL seconds ago"""
+        cutoff = time.monotonic() - RESOLVED_INCIDENT_TTL
+        while self._resolved_ring and self._resolved_ring[0][0] < cutoff:
+            _, incident_id = self._resolved_ring.popleft()
+            incident = self.incidents.get(incident_id)
+            if incident is not None and incident.status == "resolved":
+                del self.incidents[incident_id]
     
     async def shutdown(self):
         """Shutdown the agent"""
         self.running = False
+        self._ml_executor.shutdown(wait=False)
         logger.info("🛑 Agent shutting down...")
\ No newline at end of file
@@ -6,6 +6,22 @@ class LocalAI:
             "recommended_action": "restart_service"
         }
 
+    def analyze_incidents_batch(self, groups):
+        return [self.analyze_incident(incidents) for incidents in groups]
+
+    def detect_anomaly(self, metrics):
+        return self.detect_anomaly_batch([metrics])[0]
+
+    def detect_anomaly_batch(self, metrics_list):
+        results = []
+        for metrics in metrics_list:
+            cpu = metrics.get("cpu_usage", 0)
+            results.append({
+                "is_anomaly": cpu > 90,
+                "probability": min(cpu / 100, 1.0)
+            })
+        return results
+
     def decide_action(self, analysis, service_info):
         if analysis["confidence"] >= 0.7:
             return {
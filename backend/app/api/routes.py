@@ -1,35 +1,28 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Response
 from datetime import datetime
 import uuid
 
 from app.core.state import get_agent
-from app.models.schemas import Service, Incident
+from app.models.schemas import Incident
 
 router = APIRouter(prefix="/api/v1")
 
 
-@router.get("/services", response_model=List[Service])
+@router.get("/services")
 async def get_services():
     agent = get_agent()
     if not agent:
         return []
-    return list(agent.services.values())
+    return Response(agent.services_json(), media_type="application/json")
 
 
-@router.get("/incidents", response_model=List[Incident])
+@router.get("/incidents")
 async def get_incidents(active: bool = True):
     agent = get_agent()
     if not agent:
         return []
 
-    if active:
-        return [
-            i for i in agent.incidents.values()
-            if i.status != "resolved"
-        ]
-
-    return list(agent.incidents.values())
+    return Response(agent.incidents_json(active), media_type="application/json")
 
 
 @router.post("/simulate/incident")
@@ -38,10 +31,10 @@ async def simulate_incident():
     if not agent or not agent.services:
         raise HTTPException(status_code=404, detail="No services found")
 
-    svc = list(agent.services.values())[0]
+    svc = next(iter(agent.services.values()))
 
     incident = Incident(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         service_id=svc.id,
         service_name=svc.name,
         type="simulated",
@@ -52,6 +45,6 @@ async def simulate_incident():
         detected_at=datetime.now()
     )
 
-    agent.incidents[incident.id] = incident
+    agent.add_incident(incident)
 
     return {"success": True, "incident_id": incident.id}
@@ -1,15 +1,117 @@
+import asyncio
+from contextlib import suppress
+from typing import Set
+
+import orjson
 from fastapi import WebSocket
 
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Redis pub/sub channel shared by every worker's WebSocketManager
+EVENTS_CHANNEL = "autosre:events"
+
+# Longest wait between attempts to resubscribe after losing Redis
+MAX_RESUBSCRIBE_DELAY = 30
+
+# Max outgoing messages waiting to be sent; the oldest are dropped beyond this
+BROADCAST_QUEUE_SIZE = 10_000
+
 class WebSocketManager:
     def __init__(self):
-        self.connections = []
+        self.connections: Set[WebSocket] = set()
+        self._redis = None
+        self._listener = None
+        # True only while the listener is receiving our channel, so it will
+        # hand published events to this worker's own clients
+        self._subscribed = False
+        # Created with the dispatcher, so it binds to the loop that drains it
+        self._queue = None
+        self._dispatcher = None
 
     async def connect(self, ws: WebSocket):
         await ws.accept()
-        self.connections.append(ws)
+        self.connections.add(ws)
+
+    def disconnect(self, ws: WebSocket):
+        self.connections.discard(ws)
+
+    async def start_backplane(self, redis):
+        # Publish through Redis so clients on every worker get each event
+        self._redis = redis
+        self._listener = asyncio.create_task(self._listen(redis))
+
+    async def close(self):
+        self._redis = None
+        self._subscribed = False
+        for task in (self._listener, self._dispatcher):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._listener = None
+        self._dispatcher = None
+        self._queue = None
 
     async def broadcast(self, message: dict):
-        for ws in self.connections:
-            await ws.send_json(message)
+        # Serialize once for all clients instead of once per send_json
+        await self.broadcast_raw(orjson.dumps(message))
+
+    async def broadcast_raw(self, data: bytes):
+        # Queue and return at once; slow clients only delay the dispatcher
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue(maxsize=BROADCAST_QUEUE_SIZE)
+            self._dispatcher = asyncio.create_task(self._dispatch(self._queue))
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(data)
+
+    async def _dispatch(self, queue):
+        while True:
+            data = await queue.get()
+            if self._redis is not None:
+                try:
+                    await self._redis.publish(EVENTS_CHANNEL, data)
+                    if self._subscribed:
+                        continue
+                except Exception as e:
+                    logger.error(f"Redis publish failed, sending locally: {e}")
+            # Not subscribed (yet, or any more): the listener won't deliver
+            # this event here, so send it to local clients directly
+            await self._local_broadcast(data)
+
+    async def _listen(self, redis):
+        delay = 1
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(EVENTS_CHANNEL)
+                    self._subscribed = True
+                    delay = 1
+                    try:
+                        async for msg in pubsub.listen():
+                            if msg["type"] == "message":
+                                await self._local_broadcast(msg["data"])
+                    finally:
+                        self._subscribed = False
+                logger.warning("Redis subscription closed")
+            except Exception as e:
+                logger.error(f"Redis subscription failed: {e}")
+
+            logger.info(f"Resubscribing to {EVENTS_CHANNEL} in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESUBSCRIBE_DELAY)
+
+    async def _local_broadcast(self, data: bytes):
+        # Send to every local client at once and drop the ones that failed
+        connections = list(self.connections)
+        results = await asyncio.gather(
+            *(ws.send_bytes(data) for ws in connections),
+            return_exceptions=True
+        )
+        for ws, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.connections.discard(ws)
 
 manager = WebSocketManager()
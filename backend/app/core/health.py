@@ -2,11 +2,36 @@ import aiohttp
 import asyncio
 
 class HealthChecker:
+    def __init__(self):
+        # One pooled keep-alive session for every probe. Created lazily
+        # because aiohttp sessions must be built inside a running loop.
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                keepalive_timeout=60,
+                # Service hostnames rarely change; skip re-resolving per probe
+                use_dns_cache=True,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=3)
+            )
+        return self._session
+
     async def check(self, service) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"http://{service.name}:{service.port}{service.health_endpoint}"
-                async with session.get(url, timeout=3) as response:
-                    return response.status == 200
+            url = f"http://{service.name}:{service.port}{service.health_endpoint}"
+            async with self._get_session().get(url) as response:
+                return response.status == 200
         except (aiohttp.ClientError, asyncio.TimeoutError):
             return False
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,12 +1,51 @@
 import asyncio
 
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds between monitoring ticks
+TICK_INTERVAL = 5
+# Max seconds a single service check may take before it is abandoned
+CHECK_TIMEOUT = 4
+
 class Scheduler:
     def __init__(self, agent):
         self.agent = agent
         self.running = True
+        self._wake = asyncio.Event()
+
+    def wake(self):
+        # Start the next tick now instead of waiting out the interval
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
 
     async def start(self):
+        loop = asyncio.get_running_loop()
         while self.running:
-            for service in self.agent.services.values():
-                await self.agent.monitor_service(service)
-            await asyncio.sleep(5)
+            tick_start = loop.time()
+            services = list(self.agent.services.values())
+            results = await asyncio.gather(
+                *(asyncio.wait_for(self.agent.monitor_service(service), CHECK_TIMEOUT)
+                  for service in services),
+                return_exceptions=True
+            )
+            for service, result in zip(services, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.error(f"Monitoring timed out for {service.name}")
+                elif isinstance(result, Exception):
+                    logger.error(f"Monitoring failed for {service.name}: {result!r}")
+
+            # Sleep out the rest of the tick, unless woken early
+            elapsed = loop.time() - tick_start
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(),
+                    timeout=max(0, TICK_INTERVAL - elapsed)
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
@@ -1,20 +1,76 @@
-from app.models.schemas import Service
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+import orjson
 
-_agent = None
+from app.models.schemas import Service
 
+# Max incidents kept in memory; the oldest are dropped beyond this
+MAX_INCIDENTS = 10_000
 
 class AutoSREAgent:
     def __init__(self):
         self.services = {}
         self.incidents = {}
+        # Unresolved incidents only, so active queries skip the history
+        self.active_incidents = {}
+        # Incident ids in insertion order, used to evict the oldest
+        self.incident_order = deque()
+
+        # Bumped on every service change; tags the serialized services blob
+        self._services_version = 0
+        self._services_cache = (-1, b"")
+
+        # Same for incidents, one blob per value of the active flag
+        self._incidents_version = 0
+        self._incidents_cache = {True: (-1, b""), False: (-1, b"")}
+
+    def add_service(self, service):
+        self.services[service.id] = service
+        self._services_version += 1
+
+    def add_incident(self, incident):
+        if len(self.incident_order) >= MAX_INCIDENTS:
+            oldest = self.incident_order.popleft()
+            self.incidents.pop(oldest, None)
+            self.active_incidents.pop(oldest, None)
+
+        self.incidents[incident.id] = incident
+        self.incident_order.append(incident.id)
+        if incident.status != "resolved":
+            self.active_incidents[incident.id] = incident
+        self._incidents_version += 1
+
+    def resolve_incident(self, incident_id):
+        incident = self.active_incidents.pop(incident_id, None)
+        if incident is not None:
+            incident.status = "resolved"
+            incident.resolved_at = datetime.now()
+            self._incidents_version += 1
+        return incident
+
+    def services_json(self) -> bytes:
+        version, blob = self._services_cache
+        if version != self._services_version:
+            blob = orjson.dumps([s.dict() for s in self.services.values()])
+            self._services_cache = (self._services_version, blob)
+        return blob
+
+    def incidents_json(self, active: bool) -> bytes:
+        version, blob = self._incidents_cache[active]
+        if version != self._incidents_version:
+            incidents = self.active_incidents if active else self.incidents
+            blob = orjson.dumps([i.dict() for i in incidents.values()])
+            self._incidents_cache[active] = (self._incidents_version, blob)
+        return blob
 
 
+@lru_cache(maxsize=1)
 def get_agent():
-    global _agent
-    if _agent is None:
-        _agent = AutoSREAgent()
-        _seed_services(_agent)
-    return _agent
+    agent = AutoSREAgent()
+    _seed_services(agent)
+    return agent
 
 
 def _seed_services(agent):
@@ -34,4 +90,4 @@ def _seed_services(agent):
     ]
 
     for svc in services:
-        agent.services[svc.id] = svc
+        agent.add_service(svc)
@@ -1,9 +1,40 @@
-﻿from fastapi import FastAPI
+﻿import os
+from contextlib import asynccontextmanager
+
+import orjson
+import redis.asyncio as aioredis
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router
+from app.api.websockets import manager as ws_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Without Redis, broadcasts only reach clients of this process
+    redis = None
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        redis = aioredis.from_url(redis_url)
+        await ws_manager.start_backplane(redis)
+
+    try:
+        yield
+    finally:
+        await ws_manager.close()
+        if redis is not None:
+            await redis.aclose()
+
+
+app = FastAPI(
+    title="AutoSRE API",
+    version="1.0",
+    lifespan=lifespan
+)
 
-app = FastAPI(title="AutoSRE API", version="1.0")
+# /health never changes, so its body is serialized once at import
+_HEALTH_BYTES = orjson.dumps({"status": "ok"})
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,6 +42,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers reuse preflight results for a day
+    max_age=86400,
 )
 
 app.include_router(router)
@@ -18,4 +51,4 @@ app.include_router(router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+
+from app.core.state import get_agent
+from app.main import app
+
+
+def _client():
+    get_agent.cache_clear()
+    return TestClient(app)
+
+
+def test_simulated_incident_is_listed_immediately():
+    with _client() as client:
+        assert client.get("/api/v1/incidents").json() == []
+
+        incident_id = client.post("/api/v1/simulate/incident").json()["incident_id"]
+
+        incidents = client.get("/api/v1/incidents").json()
+        assert [i["id"] for i in incidents] == [incident_id]
+
+
+def test_fresh_agent_does_not_see_previous_incidents():
+    with _client() as client:
+        client.post("/api/v1/simulate/incident")
+        assert len(client.get("/api/v1/incidents").json()) == 1
+
+    with _client() as client:
+        assert client.get("/api/v1/incidents").json() == []
+
+
+def test_resolved_incident_leaves_active_listing():
+    with _client() as client:
+        incident_id = client.post("/api/v1/simulate/incident").json()["incident_id"]
+        assert len(client.get("/api/v1/incidents").json()) == 1
+
+        get_agent().resolve_incident(incident_id)
+
+        assert client.get("/api/v1/incidents").json() == []
+        incidents = client.get("/api/v1/incidents", params={"active": False}).json()
+        assert [(i["id"], i["status"]) for i in incidents] == [(incident_id, "resolved")]
@@ -0,0 +1,32 @@
+import asyncio
+
+from app.core.scheduler import Scheduler
+
+
+class FakeAgent:
+    def __init__(self):
+        self.services = {"svc-1": object()}
+        self.checks = 0
+
+    async def monitor_service(self, service):
+        self.checks += 1
+
+
+def test_wake_starts_next_tick_and_stop_ends_loop():
+    async def run():
+        agent = FakeAgent()
+        scheduler = Scheduler(agent)
+        task = asyncio.create_task(scheduler.start())
+        await asyncio.sleep(0.05)
+        assert agent.checks == 1
+
+        # Well under TICK_INTERVAL, so only wake() can trigger this tick
+        scheduler.wake()
+        await asyncio.sleep(0.05)
+        assert agent.checks == 2
+
+        scheduler.stop()
+        await asyncio.wait_for(task, timeout=1)
+        assert agent.checks == 2
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from app.core.state import AutoSREAgent
+from app.models.schemas import Incident
+
+
+def _incident(n, status="active"):
+    return Incident(
+        id=f"inc-{n}",
+        service_id="svc-1",
+        service_name="payment-service",
+        type="high_cpu",
+        severity=0.5,
+        description="test",
+        metrics={},
+        status=status,
+        detected_at=datetime.now(),
+    )
+
+
+def test_add_incident_evicts_oldest_beyond_limit(monkeypatch):
+    monkeypatch.setattr("app.core.state.MAX_INCIDENTS", 2)
+    agent = AutoSREAgent()
+
+    for n in range(3):
+        agent.add_incident(_incident(n))
+
+    assert list(agent.incidents) == ["inc-1", "inc-2"]
+    assert list(agent.active_incidents) == ["inc-1", "inc-2"]
+    assert list(agent.incident_order) == ["inc-1", "inc-2"]
+
+
+def test_resolved_incidents_are_not_active():
+    agent = AutoSREAgent()
+    agent.add_incident(_incident(0, status="resolved"))
+
+    assert list(agent.incidents) == ["inc-0"]
+    assert agent.active_incidents == {}
@@ -0,0 +1,159 @@
+import asyncio
+
+from app.api.websockets import WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = asyncio.Queue()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.redis.subscribers.discard(self.messages)
+
+    async def subscribe(self, channel):
+        await self.redis.allow_subscribe.wait()
+        self.redis.subscribers.add(self.messages)
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+
+class FakeRedis:
+    """Loops published messages back to subscribers of this process"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.allow_subscribe = asyncio.Event()
+        self.published = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        self.published.append(data)
+        for messages in self.subscribers:
+            messages.put_nowait({"type": "message", "data": data})
+        return len(self.subscribers)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_events_published_before_subscribing_are_delivered_locally():
+    async def run():
+        manager = WebSocketManager()
+        ws = FakeWebSocket()
+        manager.connections.add(ws)
+        redis = FakeRedis()
+        await manager.start_backplane(redis)
+
+        await manager.broadcast({"n": 1})
+        await _settle()
+        assert redis.published == [b'{"n":1}']
+        assert ws.sent == [b'{"n":1}']
+
+        # Once subscribed, delivery goes through Redis exactly once
+        redis.allow_subscribe.set()
+        await _settle()
+        await manager.broadcast({"n": 2})
+        await _settle()
+        assert ws.sent == [b'{"n":1}', b'{"n":2}']
+
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_manager_keeps_broadcasting_across_event_loops():
+    manager = WebSocketManager()
+    ws = FakeWebSocket()
+    manager.connections.add(ws)
+
+    async def session(n):
+        await manager.broadcast({"n": n})
+        await _settle()
+        dispatcher = manager._dispatcher
+        await manager.close()
+        assert dispatcher.cancelled()
+
+    asyncio.run(session(1))
+    asyncio.run(session(2))
+    assert ws.sent == [b'{"n":1}', b'{"n":2}']
+
+
+class DeadWebSocket:
+    async def send_bytes(self, data):
+        raise RuntimeError("client went away")
+
+
+class FailingRedis(FakeRedis):
+    async def publish(self, channel, data):
+        raise ConnectionError("redis down")
+
+
+def test_local_broadcast_drops_clients_that_fail():
+    async def run():
+        manager = WebSocketManager()
+        alive, dead = FakeWebSocket(), DeadWebSocket()
+        manager.connections.update({alive, dead})
+
+        await manager._local_broadcast(b"x")
+
+        assert manager.connections == {alive}
+        assert alive.sent == [b"x"]
+
+    asyncio.run(run())
+
+
+def test_full_queue_drops_oldest_event(monkeypatch):
+    monkeypatch.setattr("app.api.websockets.BROADCAST_QUEUE_SIZE", 2)
+
+    async def run():
+        manager = WebSocketManager()
+        ws = FakeWebSocket()
+        manager.connections.add(ws)
+
+        # The dispatcher doesn't run until we yield, so the queue fills up
+        for n in range(3):
+            await manager.broadcast({"n": n})
+        await _settle()
+
+        assert ws.sent == [b'{"n":1}', b'{"n":2}']
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_failed_publish_is_delivered_locally():
+    async def run():
+        manager = WebSocketManager()
+        ws = FakeWebSocket()
+        manager.connections.add(ws)
+        redis = FailingRedis()
+        redis.allow_subscribe.set()
+        await manager.start_backplane(redis)
+        await _settle()
+        assert manager._subscribed
+
+        await manager.broadcast({"n": 1})
+        await _settle()
+
+        assert ws.sent == [b'{"n":1}']
+        await manager.close()
+
+    asyncio.run(run())